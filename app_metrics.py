@@ -0,0 +1,273 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+from streamlit.runtime import exists as runtime_exists
+from streamlit.runtime import get_instance as get_runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Streamlit reruns the app script but keeps imported modules, so everything
+# below is shared by all sessions served from this process.
+
+METRICS_PORT = int(os.environ.get("DOCKING_METRICS_PORT", "9464"))
+METRICS_FILE = os.environ.get("DOCKING_METRICS_FILE")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+_lock = threading.Lock()
+_registry = []
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus text format"""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            counts, total = self.series.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self.series[key] = (counts, total + value)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in sorted(self.series.items()):
+            bounds = [str(b) for b in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, counts):
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', bound),))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {counts[-1]}")
+        return lines
+
+
+class Gauge:
+    """Single value that can go up and down"""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.value = 0
+        _registry.append(self)
+
+    def set(self, value):
+        with _lock:
+            self.value = value
+
+    def inc(self, amount=1):
+        with _lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_max(self, value):
+        with _lock:
+            self.value = max(self.value, value)
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge",
+                f"{self.name} {self.value}"]
+
+
+class LabeledGauge:
+    """Gauge with one series per label value, e.g. per session"""
+
+    def __init__(self, name, help_text, label):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.series = {}
+        _registry.append(self)
+
+    def set(self, label_value, value):
+        with _lock:
+            self.series[label_value] = value
+
+    def remove(self, label_value):
+        with _lock:
+            self.series.pop(label_value, None)
+
+    def labels(self):
+        with _lock:
+            return list(self.series)
+
+    def total(self):
+        with _lock:
+            return sum(self.series.values())
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for label_value, value in sorted(self.series.items()):
+            lines.append(f"{self.name}{_format_labels(((self.label, label_value),))} {value}")
+        return lines
+
+
+RERUN_SECONDS = Histogram("docking_app_rerun_seconds",
+                          "Wall time of a full script rerun, from page config to the end of the page", LATENCY_BUCKETS)
+PAGE_SECONDS = Histogram("docking_app_page_seconds",
+                         "Wall time of each page function", LATENCY_BUCKETS)
+SESSION_STATE_BYTES = Histogram("docking_app_session_state_bytes",
+                                "Estimated size of session state at the end of a rerun", SIZE_BUCKETS)
+SESSION_STATE_MAX_BYTES = Gauge("docking_app_session_state_max_bytes",
+                                "Largest session state seen since startup")
+SESSION_STATE_CURRENT_BYTES = LabeledGauge("docking_app_session_state_current_bytes",
+                                           "Session state size of each live session after its last rerun",
+                                           "session")
+SESSION_STATE_TOTAL_BYTES = Gauge("docking_app_session_state_total_bytes",
+                                  "Session state size summed over all live sessions")
+JOBS_IN_PROGRESS = Gauge("docking_app_jobs_in_progress",
+                         "Docking jobs currently running (job queue depth)")
+JOB_SECONDS = Histogram("docking_app_job_seconds",
+                        "Wall time of a docking job", LATENCY_BUCKETS)
+
+
+def render_metrics():
+    """Return all metrics as Prometheus exposition text"""
+    lines = []
+    with _lock:
+        for metric in _registry:
+            lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def timed_page(func):
+    """Record how long a page function takes"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            PAGE_SECONDS.observe(time.perf_counter() - start, page=func.__name__)
+    return wrapper
+
+
+def estimate_size(value):
+    """Estimate the memory held by a session state value without serializing it"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if hasattr(value, "getbuffer"):
+        # Uploaded files are BytesIO objects; the buffer is a view, not a copy
+        with value.getbuffer() as buffer:
+            return buffer.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def session_state_size(session_state):
+    """Approximate session memory from the estimated size of its values"""
+    return sum(estimate_size(session_state[key]) for key in list(session_state.keys()))
+
+
+def current_session_id():
+    """Return the Streamlit session id of the running script, if any"""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def record_session_state(session_id, session_state):
+    """Update the per-session size gauges and drop sessions that have ended"""
+    size = session_state_size(session_state)
+    SESSION_STATE_BYTES.observe(size)
+    SESSION_STATE_MAX_BYTES.set_max(size)
+    if session_id is not None:
+        SESSION_STATE_CURRENT_BYTES.set(session_id, size)
+    # Streamlit has no session-end hook, so ended sessions are pruned on the next rerun
+    if runtime_exists():
+        runtime = get_runtime()
+        for other_id in SESSION_STATE_CURRENT_BYTES.labels():
+            if not runtime.is_active_session(other_id):
+                SESSION_STATE_CURRENT_BYTES.remove(other_id)
+    SESSION_STATE_TOTAL_BYTES.set(SESSION_STATE_CURRENT_BYTES.total())
+
+
+@contextmanager
+def track_rerun(session_state, started):
+    """Finish timing a rerun that began at started (a time.perf_counter() value)"""
+    try:
+        yield
+    finally:
+        RERUN_SECONDS.observe(time.perf_counter() - started)
+        record_session_state(current_session_id(), session_state)
+        if METRICS_FILE:
+            write_metrics_file(METRICS_FILE)
+
+
+@contextmanager
+def track_job():
+    """Count a docking job as queued/running while the block executes"""
+    JOBS_IN_PROGRESS.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        JOBS_IN_PROGRESS.dec()
+        JOB_SECONDS.observe(time.perf_counter() - start)
+
+
+def write_metrics_file(path):
+    """Atomically replace path with the current metrics, for node_exporter textfile collection"""
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_metrics())
+    os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server_started = False
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """Serve /metrics on localhost once per process; port 0 disables it"""
+    global _server_started
+    with _lock:
+        if _server_started or port == 0:
+            return
+        _server_started = True
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+    except OSError:
+        # Port already taken, e.g. by another app process
+        return
+    threading.Thread(target=server.serve_forever, daemon=True).start()
@@ -0,0 +1,223 @@
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+# Half-width range of the synthetic protein around its frame origin (Å);
+# a 40 Å box centred on the origin covers the whole protein
+PROTEIN_MIN_HALF_EXTENT = 12.0
+PROTEIN_MAX_HALF_EXTENT = 20.0
+# Grid spacing used by AutoDock Vina style searches (Å)
+FINE_SPACING = 0.375
+# Coarse pass spacing for the hierarchical search mode (Å)
+COARSE_SPACING = 2.0
+# Well widening used by the cheap coarse-pass score (Å)
+COARSE_WIDENING = 0.5
+# Hierarchical mode always refines at least this many pockets
+MIN_SEEDS = 8
+# Minimum distance between two reported poses (Å)
+POSE_SEPARATION = 2.0
+# Number of points scored at once, keeps memory flat for 40 Å boxes
+CHUNK_SIZE = 200_000
+
+SEARCH_MODES = ["Exhaustive", "Hierarchical"]
+
+
+def _seeded_rng(text):
+    """Random generator seeded from a stable hash of text"""
+    return np.random.default_rng(int(hashlib.sha256(text.encode()).hexdigest()[:8], 16))
+
+
+def build_receptor_field(protein, ligand, num_sites=12):
+    """Build a reproducible energy landscape of binding sites in the protein frame.
+
+    Pocket positions and the protein extent depend only on the protein, and
+    well depths and widths on the protein-ligand pair. The search box never
+    changes the field, it only selects which grid points are scored.
+    """
+    protein_rng = _seeded_rng(protein)
+    half_extent = protein_rng.uniform(PROTEIN_MIN_HALF_EXTENT, PROTEIN_MAX_HALF_EXTENT)
+    sites = protein_rng.uniform(-half_extent, half_extent, size=(num_sites, 3))
+
+    pair_rng = _seeded_rng(f"{protein}|{ligand}")
+    depths = pair_rng.uniform(3.0, 10.0, size=num_sites)
+    widths = pair_rng.uniform(0.8, 2.0, size=num_sites)
+    return {"sites": sites, "depths": depths, "widths": widths}
+
+
+def score_points(field, points, cheap=False):
+    """Score grid points against the receptor field (kcal/mol, lower is better)"""
+    sites = field["sites"]
+    depths = field["depths"]
+    widths = field["widths"]
+    if cheap:
+        # Coarse pass: slightly widened wells so narrow pockets still show up
+        # as a dip at the nearest coarse grid point
+        widths = widths + COARSE_WIDENING
+
+    scores = np.empty(len(points))
+    for start in range(0, len(points), CHUNK_SIZE):
+        chunk = points[start:start + CHUNK_SIZE]
+        dist2 = ((chunk[:, None, :] - sites[None, :, :]) ** 2).sum(axis=2)
+        scores[start:start + CHUNK_SIZE] = -(depths * np.exp(-dist2 / (2 * widths ** 2))).sum(axis=1)
+    return scores
+
+
+def make_axes(center, size, spacing):
+    """Return the per-axis coordinates of a cubic box on the protein-frame lattice"""
+    # Anchoring the lattice at the frame origin means a larger box always
+    # scores a superset of the points a smaller box scores
+    half = size / 2.0
+    return [np.arange(np.ceil((c - half) / spacing - 1e-9), np.floor((c + half) / spacing + 1e-9) + 1) * spacing
+            for c in center]
+
+
+def make_grid(center, size, spacing):
+    """Return an (N, 3) array of grid points covering a cubic box"""
+    mesh = np.meshgrid(*make_axes(center, size, spacing), indexing="ij")
+    return np.stack([m.ravel() for m in mesh], axis=1)
+
+
+def local_minima(scores, shape):
+    """Return flat indices of grid points no higher than any of their 26 neighbours"""
+    grid = np.pad(scores.reshape(shape), 1, constant_values=np.inf)
+    core = grid[1:-1, 1:-1, 1:-1]
+    is_min = np.ones(shape, dtype=bool)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                if dx == dy == dz == 0:
+                    continue
+                neighbour = grid[1 + dx:shape[0] + 1 + dx, 1 + dy:shape[1] + 1 + dy, 1 + dz:shape[2] + 1 + dz]
+                is_min &= core <= neighbour
+    return np.flatnonzero(is_min)
+
+
+def select_poses(points, scores, num_modes, energy_range):
+    """Pick the best distinct poses within energy_range of the optimum"""
+    candidates = np.flatnonzero(scores <= scores.min() + energy_range)
+    order = candidates[np.argsort(scores[candidates])]
+    chosen = []
+    for idx in order:
+        if len(chosen) >= num_modes:
+            break
+        if not chosen or np.linalg.norm(points[chosen] - points[idx], axis=1).min() >= POSE_SEPARATION:
+            chosen.append(idx)
+    return points[chosen], scores[chosen]
+
+
+def seed_count(num_modes, exhaustiveness):
+    """Number of coarse pockets the hierarchical search refines"""
+    # Twice num_modes leaves margin for pockets that hold no pose in the energy range
+    return max(2 * num_modes, exhaustiveness, MIN_SEEDS)
+
+
+def exhaustive_search(field, center, box_size):
+    """Score every point of the full-resolution grid"""
+    points = make_grid(center, box_size, FINE_SPACING)
+    return points, score_points(field, points), len(points)
+
+
+def hierarchical_search(field, center, box_size, top_k):
+    """Coarse grid pass with cheap scoring, then fine refinement of the top-k pockets"""
+    coarse_axes = make_axes(center, box_size, COARSE_SPACING)
+    coarse_points = make_grid(center, box_size, COARSE_SPACING)
+    coarse_scores = score_points(field, coarse_points, cheap=True)
+    evaluated = len(coarse_points)
+
+    # One seed per pocket: neighbouring coarse points of the same well are
+    # only COARSE_SPACING apart, so ranking raw points would refine one pocket k times
+    minima = local_minima(coarse_scores, tuple(len(axis) for axis in coarse_axes))
+    seeds = coarse_points[minima[np.argsort(coarse_scores[minima])][:top_k]]
+
+    # Refine on the exhaustive fine lattice so overlapping subvolumes share points
+    fine_axes = make_axes(center, box_size, FINE_SPACING)
+    lower = np.array([axis[0] for axis in fine_axes])
+    upper = np.array([len(axis) - 1 for axis in fine_axes])
+    reach = int(np.ceil(COARSE_SPACING / FINE_SPACING))
+    offsets = np.stack(np.meshgrid(*[np.arange(-reach, reach + 1)] * 3, indexing="ij"), axis=-1).reshape(-1, 3)
+    seed_indices = np.rint((seeds - lower) / FINE_SPACING).astype(int)
+    indices = np.unique(np.clip((seed_indices[:, None, :] + offsets).reshape(-1, 3), 0, upper), axis=0)
+
+    refined_points = lower + indices * FINE_SPACING
+    evaluated += len(refined_points)
+    return refined_points, score_points(field, refined_points), evaluated
+
+
+def search(field, center, box_size, search_mode, num_modes, exhaustiveness):
+    """Run the grid search for the selected mode"""
+    if search_mode == "Hierarchical":
+        top_k = seed_count(num_modes, exhaustiveness)
+        return hierarchical_search(field, center, box_size, top_k)
+    return exhaustive_search(field, center, box_size)
+
+
+def run_docking(protein, ligand, center=(0.0, 0.0, 0.0), box_size=20, exhaustiveness=8,
+                num_modes=9, energy_range=3, search_mode="Exhaustive"):
+    """Run a grid docking search and return poses in the results table format"""
+    field = build_receptor_field(protein, ligand)
+    points, scores, _ = search(field, center, box_size, search_mode, num_modes, exhaustiveness)
+    pose_points, pose_scores = select_poses(points, scores, num_modes, energy_range)
+    return poses_to_dataframe(pose_points, pose_scores)
+
+
+def poses_to_dataframe(pose_points, pose_scores):
+    """Convert pose coordinates and scores to the results DataFrame"""
+    best_point = pose_points[0]
+    best_score = pose_scores[0]
+    results = []
+    for i, (point, score) in enumerate(zip(pose_points, pose_scores)):
+        rmsd = float(np.linalg.norm(point - best_point))
+        results.append({
+            'Pose': i + 1,
+            'Binding_Affinity_kcal_mol': round(float(score), 2),
+            'RMSD_l.b.': round(rmsd, 2),
+            'Efficiency': round(float(score / best_score), 3)
+        })
+    return pd.DataFrame(results)
+
+
+def benchmark(box_size=40, trials=3, num_modes_grid=(1, 9, 20), exhaustiveness_grid=(1, 8, 32),
+              energy_range=3):
+    """Compare exhaustive and hierarchical search on whole-protein boxes"""
+    center = (0.0, 0.0, 0.0)
+    rows = []
+    for trial in range(trials):
+        field = build_receptor_field(f"benchmark-{trial}", "ligand")
+
+        # The exhaustive grid does not depend on num_modes or exhaustiveness
+        start = time.perf_counter()
+        full_points, full_scores, full_evals = search(field, center, box_size, "Exhaustive", 1, 1)
+        full_time = time.perf_counter() - start
+
+        for num_modes in num_modes_grid:
+            for exhaustiveness in exhaustiveness_grid:
+                start = time.perf_counter()
+                fast_points, fast_scores, fast_evals = search(field, center, box_size, "Hierarchical",
+                                                              num_modes, exhaustiveness)
+                fast_time = time.perf_counter() - start
+
+                full_poses, full_pose_scores = select_poses(full_points, full_scores, num_modes, energy_range)
+                fast_poses, fast_pose_scores = select_poses(fast_points, fast_scores, num_modes, energy_range)
+                recovered = sum(np.linalg.norm(fast_poses - pose, axis=1).min() < POSE_SEPARATION
+                                for pose in full_poses)
+                rows.append({
+                    'Trial': trial + 1,
+                    'Num_modes': num_modes,
+                    'Exhaustiveness': exhaustiveness,
+                    'Exhaustive_s': round(full_time, 3),
+                    'Hierarchical_s': round(fast_time, 3),
+                    'Speedup': round(full_time / fast_time, 1),
+                    'Exhaustive_evals': full_evals,
+                    'Hierarchical_evals': fast_evals,
+                    'Best_gap_kcal_mol': round(float(fast_pose_scores[0] - full_pose_scores[0]), 3),
+                    'Exhaustive_poses': len(full_poses),
+                    'Hierarchical_poses': len(fast_poses),
+                    'Recovered_poses': int(recovered)
+                })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
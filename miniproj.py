@@ -1,7 +1,14 @@
 import streamlit as st
-import pandas as pd
 import time
 
+import app_metrics
+from docking_engine import SEARCH_MODES, run_docking
+from report_generator import REPORT_FORMATS, render_reports
+
+# Rerun timing starts before any Streamlit work so page config, CSS,
+# session state setup and the footer are included
+RERUN_STARTED = time.perf_counter()
+
 # Set page configuration
 st.set_page_config(
     page_title="Molecular Docking Application",
@@ -78,24 +85,13 @@ if 'current_page' not in st.session_state:
     st.session_state.current_page = "main"
 if 'docking_results' not in st.session_state:
     st.session_state.docking_results = None
+if 'docking_reports' not in st.session_state:
+    st.session_state.docking_reports = None
 if 'protein_selected' not in st.session_state:
     st.session_state.protein_selected = None
 if 'ligand_selected' not in st.session_state:
     st.session_state.ligand_selected = None
 
-def simulate_docking_results():
-    """Generate simulated docking results"""
-    results = []
-    for i in range(10):  # Generate 10 poses
-        results.append({
-            'Pose': i + 1,
-            'Binding_Affinity_kcal_mol': round(-8.5 + i * 0.3 + (i * 0.1), 2),
-            'RMSD_l.b.': round(0.0 + i * 0.2, 2),
-            'RMSD_u.b.': round(0.5 + i * 0.3, 2),
-            'Efficiency': round(0.95 - i * 0.05, 3)
-        })
-    return pd.DataFrame(results)
-
 def main():
     st.markdown('<h1 class="main-header">🧬 Molecular Docking Application</h1>', unsafe_allow_html=True)
     
@@ -122,6 +118,7 @@ def main():
     elif st.session_state.current_page == "help":
         help_page()
 
+@app_metrics.timed_page
 def main_dashboard():
     # Welcome section
     st.markdown("""
@@ -291,6 +288,9 @@ def main_dashboard():
                                    help="Maximum energy difference between modes")
             box_size = st.slider("Search Box Size (Å)", 10, 40, 20,
                                 help="Size of the search space")
+            search_mode = st.radio("Search Mode", SEARCH_MODES, horizontal=True,
+                                  help="Hierarchical runs a coarse pass and refines only the most "
+                                       "promising regions - much faster for large (blind docking) boxes")
         
         with col3:
             center_x = st.number_input("Center X", value=0.0, format="%.2f")
@@ -305,28 +305,36 @@ def main_dashboard():
                         help="Start the molecular docking simulation"):
                 st.info("🔄 Starting molecular docking simulation...")
                 
-                # Simulate docking process
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                stages = [
-                    "Preparing protein structure...",
-                    "Preparing ligand structure...",
-                    "Setting up docking parameters...",
-                    "Running docking simulation...",
-                    "Analyzing binding poses...",
-                    "Generating final results..."
-                ]
-                
-                for i, stage in enumerate(stages):
-                    status_text.text(f"⏳ {stage}")
-                    progress_bar.progress((i + 1) / len(stages))
-                    time.sleep(1.2)
-                
-                # Generate and store results
-                st.session_state.docking_results = simulate_docking_results()
+                with app_metrics.track_job():
+                    start_time = time.perf_counter()
+                    status_text.text(f"⏳ Running {search_mode.lower()} docking search...")
+                    progress_bar.progress(0.1)
+                    
+                    # Generate and store results
+                    st.session_state.docking_results = run_docking(
+                        st.session_state.protein_selected,
+                        st.session_state.ligand_selected,
+                        center=(center_x, center_y, center_z),
+                        box_size=box_size,
+                        exhaustiveness=exhaustiveness,
+                        num_modes=num_modes,
+                        energy_range=energy_range,
+                        search_mode=search_mode
+                    )
+                    
+                    status_text.text("⏳ Generating final results...")
+                    progress_bar.progress(0.8)
+                    st.session_state.docking_reports = render_reports(
+                        st.session_state.protein_selected,
+                        {st.session_state.ligand_selected: st.session_state.docking_results}
+                    )
+                    progress_bar.progress(1.0)
+                    elapsed = time.perf_counter() - start_time
                 
-                status_text.text("✅ Docking simulation completed successfully!")
+                status_text.text(f"✅ Docking simulation completed successfully in {elapsed:.2f} s!")
                 st.success("🎉 Molecular docking simulation completed!")
                 st.balloons()
                 
@@ -368,6 +376,7 @@ def main_dashboard():
         </div>
         """, unsafe_allow_html=True)
 
+@app_metrics.timed_page
 def results_page():
     st.markdown('<div class="section-header">📊 Docking Results & Analysis</div>', unsafe_allow_html=True)
     
@@ -431,39 +440,14 @@ def results_page():
             )
         
         with col2:
-            # Create a summary report
-            report = f"""# Molecular Docking Results Report
-
-## Input Information
-- Protein: {st.session_state.protein_selected or 'Not specified'}
-- Ligand: {st.session_state.ligand_selected or 'Not specified'}
-- Timestamp: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Summary Statistics
-- Total Poses Generated: {len(df)}
-- Best Binding Affinity: {best_affinity} kcal/mol
-- Average RMSD (l.b.): {avg_rmsd:.2f} Å
-- Highest Efficiency: {best_efficiency:.3f}
-
-## Top 5 Binding Poses
-{df.head(5).to_string(index=False)}
-
-## Analysis Notes
-- Lower binding affinity values indicate stronger protein-ligand binding
-- RMSD values show structural deviation from reference pose
-- Efficiency metric combines binding strength and structural quality
-- Results are ordered by binding affinity (strongest first)
-
-## Recommendations
-- Focus on poses 1-3 for further analysis
-- Consider experimental validation of top-ranked poses
-- Review binding site interactions for optimization opportunities
-"""
+            # Reports are rendered once when the docking job completes
+            report_format = st.selectbox("Report format", list(REPORT_FORMATS), key="report_format")
+            report_meta = REPORT_FORMATS[report_format]
             st.download_button(
-                label="📄 Download Report (TXT)",
-                data=report,
-                file_name="docking_analysis_report.txt",
-                mime="text/plain"
+                label=f"📄 Download Report ({report_format})",
+                data=st.session_state.docking_reports[report_format],
+                file_name=f"docking_analysis_report.{report_meta['extension']}",
+                mime=report_meta['mime']
             )
         
         with col3:
@@ -493,6 +477,7 @@ def results_page():
             st.session_state.current_page = "main"
             st.rerun()
 
+@app_metrics.timed_page
 def help_page():
     st.markdown('<div class="section-header">ℹ️ Help & Documentation</div>', unsafe_allow_html=True)
     
@@ -514,6 +499,8 @@ def help_page():
     - **Number of Modes**: How many binding poses to generate
     - **Energy Range**: Maximum energy difference between poses
     - **Binding Site**: Center coordinates and search box size
+    - **Search Mode**: Exhaustive scores the full grid; Hierarchical does a coarse pass
+      and refines only the top regions (recommended for boxes above ~25 Å)
     
     ### Step 3: Run Simulation
     - Click "Run Molecular Docking" to start the process
@@ -622,4 +609,6 @@ st.markdown(
 )
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    app_metrics.start_metrics_server()
+    with app_metrics.track_rerun(st.session_state, RERUN_STARTED):
+        main()
\ No newline at end of file
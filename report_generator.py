@@ -0,0 +1,94 @@
+import html
+from pathlib import Path
+from string import Template
+
+import pandas as pd
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+# Download metadata for each report format
+REPORT_FORMATS = {
+    "TXT": {"extension": "txt", "mime": "text/plain"},
+    "Markdown": {"extension": "md", "mime": "text/markdown"},
+    "HTML": {"extension": "html", "mime": "text/html"},
+}
+
+# Binding strength bands, matching the interpretation on the help page
+AFFINITY_BANDS = [
+    ("Strong (< -7.0)", -float("inf"), -7.0),
+    ("Moderate (-7.0 to -5.0)", -7.0, -5.0),
+    ("Weak (> -5.0)", -5.0, float("inf")),
+]
+
+TOP_POSES = 5
+
+_templates = {}
+
+
+def load_template(name):
+    """Load a report template once and reuse it for later jobs"""
+    if name not in _templates:
+        _templates[name] = Template((TEMPLATE_DIR / name).read_text(encoding="utf-8"))
+    return _templates[name]
+
+
+def affinity_distribution(poses):
+    """Count poses in each binding strength band"""
+    affinity = poses['Binding_Affinity_kcal_mol']
+    rows = []
+    for label, low, high in AFFINITY_BANDS:
+        count = int(((affinity >= low) & (affinity < high)).sum())
+        rows.append({
+            'Binding': label,
+            'Poses': count,
+            'Share_%': round(100 * count / len(poses), 1)
+        })
+    return pd.DataFrame(rows)
+
+
+def render_table(df, extension):
+    """Render a DataFrame for the given report format"""
+    if extension == "html":
+        return df.to_html(index=False, border=0)
+    return df.to_string(index=False)
+
+
+def render_reports(protein, campaign):
+    """Render every report format for a completed job.
+
+    campaign maps each ligand name to its docking results DataFrame, so a
+    single docking run is a campaign with one ligand.
+    """
+    poses = pd.concat(campaign.values(), keys=campaign.keys(), names=['Ligand'])
+    poses = poses.reset_index(level=0).reset_index(drop=True)
+    best = poses.loc[poses['Binding_Affinity_kcal_mol'].idxmin()]
+    ranked = sorted(campaign.items(), key=lambda item: item[1]['Binding_Affinity_kcal_mol'].min())
+
+    reports = {}
+    for fmt, meta in REPORT_FORMATS.items():
+        extension = meta["extension"]
+        escape = html.escape if extension == "html" else str
+
+        sections = []
+        for ligand, df in ranked:
+            top = df.nsmallest(TOP_POSES, 'Binding_Affinity_kcal_mol')
+            sections.append(load_template(f"ligand_section.{extension}").substitute(
+                ligand=escape(ligand),
+                pose_count=len(df),
+                best_affinity=df['Binding_Affinity_kcal_mol'].min(),
+                top_poses=render_table(top, extension)
+            ))
+
+        reports[fmt] = load_template(f"report.{extension}").substitute(
+            protein=escape(protein or 'Not specified'),
+            ligand_count=len(campaign),
+            timestamp=pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
+            total_poses=len(poses),
+            best_affinity=best['Binding_Affinity_kcal_mol'],
+            best_ligand=escape(best['Ligand']),
+            avg_rmsd=f"{poses['RMSD_l.b.'].mean():.2f}",
+            best_efficiency=f"{poses['Efficiency'].max():.3f}",
+            distribution=render_table(affinity_distribution(poses), extension),
+            ligand_sections="".join(sections)
+        )
+    return reports